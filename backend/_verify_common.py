@@ -0,0 +1,296 @@
+"""
+Checks and runner shared by verify_deployment.py and verify_render_deployment.py
+
+Run with `python -X importtime <script> 2> import.log` to see which imports dominate start-up
+"""
+
+import os
+import sys
+import platform
+import shutil
+import importlib.util
+import importlib.metadata
+import io
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
+
+# Deep mode (--deep or VERIFY_DEEP=1) really imports every dependency instead of only locating it,
+# and runs the PDF extraction, RAG and Flask app checks that load Tesseract, the embedding model and Chroma.
+# It takes far longer, so routine runs leave it off.
+DEEP = '--deep' in sys.argv[1:] or os.environ.get('VERIFY_DEEP', '').strip().lower() in ('1', 'true', 'yes')
+
+REQUIRED_MODULES = (
+    'flask', 'flask_cors', 'PyPDF2', 'sentence_transformers',
+    'chromadb', 'google.generativeai', 'dotenv', 'numpy',
+    'pandas', 'werkzeug', 'transformers', 'torch', 'requests',
+    'pdf2image', 'pytesseract', 'PIL'
+)
+
+# Import name -> distribution name, where the two differ by more than case and separators
+_DISTRIBUTION_NAMES = {
+    'PIL': 'Pillow',
+    'dotenv': 'python-dotenv',
+    'google.generativeai': 'google-generativeai',
+}
+_RE_NAME_SEPARATORS = re.compile(r'[-_.]+')
+
+def _normalize(name):
+    return _RE_NAME_SEPARATORS.sub('-', name).lower()
+
+@lru_cache(maxsize=None)
+def _installed_versions():
+    """Normalized distribution name -> version, read from the installed metadata in one pass."""
+    versions = {}
+    for dist in importlib.metadata.distributions():
+        name = dist.metadata['Name']
+        if name: versions.setdefault(_normalize(name), dist.version)
+    return versions
+
+def _installed_version(module):
+    """Version of the distribution providing module, '' if only its files are found, None if missing."""
+    version = _installed_versions().get(_normalize(_DISTRIBUTION_NAMES.get(module, module)))
+    if version is not None: return version
+    # Modules on sys.path without distribution metadata (vendored, or run from a checkout)
+    try:
+        return '' if importlib.util.find_spec(module) is not None else None
+    except ImportError:  # parent package of a dotted name is missing
+        return None
+
+class _ThreadOutput:
+    """sys.stdout stand-in that collects each check thread's prints in its own buffer."""
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (self.stream if buffer is None else buffer).write(text)
+
+    def flush(self):
+        if getattr(self.local, 'buffer', None) is None: self.stream.flush()
+
+    def __getattr__(self, name):
+        # encoding, isatty(), fileno()... come from the real stream (tqdm progress bars read them)
+        return getattr(self.stream, name)
+
+def _run_check(output, name, check_func):
+    output.local.buffer = io.StringIO()
+    try:
+        result = check_func()
+    except Exception as e:
+        print(f"  ❌ {name} check failed: {e}")
+        result = False
+    return result, output.local.buffer.getvalue()
+
+# One processor of each kind is shared by every check that needs it, in whichever script runs it
+@lru_cache(maxsize=1)
+def _pdf():
+    from pdf_processor import PDFProcessor
+    return PDFProcessor()
+
+@lru_cache(maxsize=1)
+def _rag():
+    # The app's own instance (built when tasks is imported), so the Flask check does not open
+    # a second RAGProcessor on the same Chroma path
+    from tasks import rag_processor
+    return rag_processor
+
+@lru_cache(maxsize=None)
+def _which(name):
+    """Path of an executable on PATH, looked up once per script run."""
+    return shutil.which(name)
+
+def _skipped_for_dependencies(name):
+    print(f"\n⏭  {name} skipped: required dependencies are missing")
+    return None
+
+def check_platform():
+    """Check current platform"""
+    system = platform.system().lower()
+    print(f"🖥️  Platform: {system}")
+    return True
+
+def check_dependencies():
+    """Check if all required dependencies are available"""
+    print("\n📦 Checking dependencies...")
+
+    missing = []
+    for module in REQUIRED_MODULES:
+        try:
+            # Installed distributions are read from their metadata without executing any module
+            # (torch, chromadb... take seconds to import)
+            if DEEP:
+                __import__(module)
+                version = ''
+            else:
+                version = _installed_version(module)
+                if version is None: raise ImportError(module)
+            print(f"  ✅ {module} {version}" if version else f"  ✅ {module}")
+        except ImportError:
+            print(f"  ❌ {module}")
+            missing.append(module)
+
+    if missing:
+        print(f"\n❌ Missing dependencies: {missing}")
+        return False
+    else:
+        print("\n✅ All dependencies available")
+        return True
+
+def check_path_detection():
+    """Test the path detection logic"""
+    print("\n🔍 Testing path detection...")
+
+    try:
+        processor = _pdf()
+
+        # Check if tesseract command is set
+        import pytesseract
+        if pytesseract.pytesseract.tesseract_cmd:
+            print(f"  ✅ Tesseract command set: {pytesseract.pytesseract.tesseract_cmd}")
+        else:
+            print("  ❌ Tesseract command not set")
+            return False
+
+        return True
+    except Exception as e:
+        print(f"  ❌ Error testing path detection: {e}")
+        return False
+
+def check_pdf_processing():
+    """Test PDF processing functionality"""
+    print("\n📄 Testing PDF processing...")
+    if not DEEP:
+        print("  ⏭  skipped (set VERIFY_DEEP=1)")
+        return None
+
+    try:
+        processor = _pdf()
+
+        # Test with a sample PDF
+        test_file = os.path.join('..', 'data', 'monographs', 'Iron - Health Professional Fact Sheet.pdf')
+
+        if os.path.exists(test_file):
+            # The first page is enough to show extraction works and keeps any OCR to a single page
+            text = processor.extract_text_from_pdf(test_file, max_pages=1)
+            if text and len(text) > 100:
+                print(f"  ✅ PDF processing works: {len(text)} characters extracted")
+                return True
+            else:
+                print("  ❌ PDF processing failed: no text extracted")
+                return False
+        else:
+            print(f"  ⚠️  Test file not found: {test_file}")
+            return True  # Not a critical failure
+    except Exception as e:
+        print(f"  ❌ PDF processing error: {e}")
+        return False
+
+def _check_rag(heading, works_label):
+    print(heading)
+    if not DEEP:
+        print("  ⏭  skipped (set VERIFY_DEEP=1)")
+        return None
+
+    try:
+        processor = _rag()
+
+        # Test with a sample ingredient
+        test_ingredient = {
+            'name': 'Iron',
+            'amount': '18 mg',
+            'type': 'unknown'
+        }
+
+        result = processor.classify_ingredient(test_ingredient)
+        if result and 'classification' in result:
+            print(f"  ✅ {works_label}: {result['classification']}")
+            return True
+        else:
+            print("  ❌ RAG processing failed")
+            return False
+    except Exception as e:
+        print(f"  ❌ RAG processing error: {e}")
+        return False
+
+def check_rag_processing():
+    """Test RAG processing functionality"""
+    return _check_rag("\n🤖 Testing RAG processing...", "RAG processing works")
+
+def check_flask_app():
+    """Test Flask app initialization"""
+    print("\n🌐 Testing Flask app...")
+    # Importing the app builds its PDF and RAG processors, loading the embedding model and Chroma
+    if not DEEP:
+        print("  ⏭  skipped (set VERIFY_DEEP=1)")
+        return None
+
+    try:
+        from app import app
+        print("  ✅ Flask app initializes successfully")
+
+        # Test configuration
+        upload_folder = app.config.get('UPLOAD_FOLDER')
+        print(f"  ✅ Upload folder: {upload_folder}")
+
+        return True
+    except Exception as e:
+        print(f"  ❌ Flask app error: {e}")
+        return False
+
+def main(checks, title, summary_title, dependency_gated=(), width=50, next_steps=()):
+    """Run the given (name, check) pairs and print the readiness report; returns True if none failed"""
+    # Every print lands in a per-thread buffer (see _ThreadOutput); the report is written out at once
+    output = _ThreadOutput(sys.stdout)
+    output.local.buffer = report = io.StringIO()
+    sys.stdout = output
+    try:
+        return _run_checks(output, checks, title, summary_title, frozenset(dependency_gated), width, next_steps)
+    finally:
+        sys.stdout = output.stream
+        output.stream.write(report.getvalue())
+
+def _run_checks(output, checks, title, summary_title, dependency_gated, width, next_steps):
+    print(f"🚀 {title}")
+    print("=" * width)
+
+    # The checks are independent and mostly import/model-load bound, so they run side by side;
+    # each one's output is buffered and added to the report in the order given.
+    # Locating the dependencies takes milliseconds, so it runs first; without them the gated
+    # checks would only re-import the missing packages and fail again, so they are skipped.
+    results = []
+    with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+        deps_future = executor.submit(_run_check, output, "Dependencies", check_dependencies)
+        deps_ok = deps_future.result()[0]
+        futures = []
+        for name, check_func in checks:
+            if check_func is check_dependencies: futures.append(deps_future); continue
+            if not deps_ok and check_func in dependency_gated: check_func = partial(_skipped_for_dependencies, name)
+            futures.append(executor.submit(_run_check, output, name, check_func))
+        for (name, _), future in zip(checks, futures):
+            result, text = future.result()
+            print(text, end='')
+            results.append((name, result))
+
+    print("\n" + "=" * width)
+    print(f"📊 {summary_title}")
+    print("=" * width)
+
+    all_passed = True
+    for name, result in results:
+        # None marks a check that was skipped rather than run
+        status = "⏭  SKIP" if result is None else "✅ PASS" if result else "❌ FAIL"
+        print(f"{name:20} {status}")
+        if result is not None and not result:
+            all_passed = False
+
+    print("\n" + "=" * width)
+    if all_passed:
+        print("🎉 ALL CHECKS PASSED! Ready for Render deployment!")
+        for line in next_steps: print(line)
+    else:
+        print("⚠️  Some checks failed. Review issues above before deploying.")
+
+    return all_passed
@@ -2,14 +2,23 @@ from flask import Flask, request, jsonify, send_from_directory
 from flask_cors import CORS
 import os
 import json
+import tempfile
 from werkzeug.utils import secure_filename
+from werkzeug.exceptions import RequestEntityTooLarge
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.targets import BaseTarget
 from dotenv import load_dotenv
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from redis import Redis
+from rq import Queue, Retry
+from rq.job import Job
+from rq.exceptions import NoSuchJobError
 
 # Import our custom modules
-from rag_processor import RAGProcessor
-from pdf_processor import PDFProcessor
+from tasks import (pdf_processor, rag_processor, process_monographs_background, process_uploaded_monographs,
+                   announce_knowledge_base_change, KB_GENERATION_KEY)
 
 # Load environment variables
 load_dotenv()
@@ -41,75 +50,156 @@ os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs('data/monographs', exist_ok=True)
 os.makedirs('data/processed', exist_ok=True)
 
-pdf_processor = PDFProcessor()
-rag_processor = RAGProcessor()
-
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Monograph OCR/embedding jobs run in the RQ worker process (see worker.py).
+# Without REDIS_URL (local development) we fall back to an in-process thread.
+redis_url = os.environ.get('REDIS_URL')
+if redis_url:
+    redis_conn = Redis.from_url(redis_url)
+    task_queue = Queue('monographs', connection=redis_conn)
+else:
+    logger.warning("REDIS_URL not found. Monograph processing will run in-process threads.")
+    redis_conn, task_queue = None, None
+if redis_url and not os.environ.get('CHROMA_HOST'):
+    logger.warning("REDIS_URL is set without CHROMA_HOST. Documents added by the worker may not be visible to this process.")
+
 ALLOWED_EXTENSIONS = {'pdf'}
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+_kb_generation = None
+
+def sync_knowledge_base():
+    """Picks up knowledge base changes made by the RQ worker or another web process."""
+    global _kb_generation
+    if redis_conn is None: return
+    try:
+        generation = redis_conn.get(KB_GENERATION_KEY)
+    except Exception as e:
+        logger.warning(f"Could not read the knowledge base generation: {e}")
+        return
+    if generation != _kb_generation:
+        rag_processor.refresh_collection()
+        _kb_generation = generation
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def process_monographs_background(files_to_process):
-    logger.info(f"Starting background processing for {len(files_to_process)} files.")
-    processed_any = False
-    for filename, filepath in files_to_process:
+class PDFUploadTarget(BaseTarget):
+    """
+    Writes every PDF part of a multipart field to disk as it streams in. Writes are handed to
+    a single writer thread (preserving order) so disk I/O overlaps with reading the request body.
+    Each part gets its own unique file, so repeated names in one request, or concurrent requests
+    uploading the same name, never share a path; saved_files keeps the original name for display.
+    """
+    def __init__(self, upload_dir, writer):
+        super().__init__()
+        self.upload_dir = upload_dir
+        self.part_count = 0
+        self.saved_files = []
+        self._writer = writer
+        self._pending = []
+        self._fd = None
+
+    def on_start(self):
+        self.part_count += 1
+        filename = secure_filename(self.multipart_filename or '')
+        if not filename or not allowed_file(filename): return
+        fd, filepath = tempfile.mkstemp(dir=self.upload_dir, prefix=filename.rsplit('.', 1)[0] + '-', suffix='.pdf')
+        self._fd = os.fdopen(fd, 'wb')
+        self.saved_files.append((filename, filepath))
+
+    def on_data_received(self, chunk):
+        if self._fd: self._pending.append(self._writer.submit(self._fd.write, chunk))
+
+    def on_finish(self):
+        if self._fd:
+            self._pending.append(self._writer.submit(self._fd.close))
+            self._fd = None
+
+    def wait(self):
+        """Blocks until every queued write has landed, re-raising the first write error."""
+        for future in self._pending: future.result()
+        self._pending = []
+
+    def discard(self):
+        """Drops a failed upload: lets queued writes drain, then removes any files written."""
+        self.on_finish()
+        for future in self._pending: future.exception()
+        self._pending = []
+        for _, filepath in self.saved_files:
+            if os.path.exists(filepath): os.remove(filepath)
+
+def stream_pdf_uploads(upload_dir):
+    """
+    Parses the multipart body from request.stream, bypassing werkzeug's form parser.
+    Returns the target so callers can inspect part_count and saved_files.
+    """
+    max_bytes, received = app.config['MAX_CONTENT_LENGTH'], 0
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        target = PDFUploadTarget(upload_dir, writer)
+        parser = StreamingFormDataParser(headers=request.headers)
+        parser.register('files', target)
         try:
-            text_content = pdf_processor.extract_text_from_pdf(filepath)
-            
-            if text_content:
-                text_filename = filename.rsplit('.', 1)[0] + '.txt'
-                text_filepath = os.path.join('data/processed', text_filename)
-                with open(text_filepath, 'w', encoding='utf-8') as f:
-                    f.write(text_content)
-                processed_any = True
-                logger.info(f"Successfully processed {filename} in background.")
-            else:
-                logger.warning(f"Failed to extract text from {filename} in background.")
-        except Exception as e:
-            logger.error(f"Error processing {filename} in background: {e}", exc_info=True)
-    
-    if processed_any:
-        logger.info("Background processing complete. Rebuilding knowledge base...")
-        rag_processor.build_knowledge_base('data/processed')
-        logger.info("Knowledge base rebuild complete.")
+            while chunk := request.stream.read(UPLOAD_CHUNK_SIZE):
+                received += len(chunk)
+                if received > max_bytes: raise RequestEntityTooLarge()
+                parser.data_received(chunk)
+            target.wait()
+        except Exception:
+            target.discard()
+            raise
+    return target
 
 @app.route('/api/upload-monographs', methods=['POST'])
 def upload_monographs():
     try:
-        if 'files' not in request.files: return jsonify({'error': 'No files provided'}), 400
-        files = request.files.getlist('files')
-        files_to_process = []
-        for file in files:
-            if not file.filename or not allowed_file(file.filename): continue
-            filename = secure_filename(file.filename)
-            filepath = os.path.join('data/monographs', filename) 
-            file.save(filepath)
-            files_to_process.append((filename, filepath))
+        if request.mimetype != 'multipart/form-data': return jsonify({'error': 'No files provided'}), 400
+        upload = stream_pdf_uploads('data/monographs')
+        if not upload.part_count: return jsonify({'error': 'No files provided'}), 400
+        files_to_process = upload.saved_files
         if not files_to_process:
             return jsonify({'message': 'No valid PDF files to process.'}), 400
-        thread = threading.Thread(target=process_monographs_background, args=(files_to_process,))
-        thread.start()
+        if task_queue is None:
+            thread = threading.Thread(target=process_monographs_background, args=(files_to_process,))
+            thread.start()
+            job_id = None
+        else:
+            uploads = []
+            for filename, filepath in files_to_process:
+                with open(filepath, 'rb') as f: uploads.append((filename, f.read()))
+            job = task_queue.enqueue(process_uploaded_monographs, uploads, job_timeout='1h', retry=Retry(max=2, interval=[30, 120]))
+            job_id = job.id
         return jsonify({
-            'message': f'Accepted {len(files_to_process)} files. The knowledge base will be updated in the background.'
+            'message': f'Accepted {len(files_to_process)} files. The knowledge base will be updated in the background.',
+            'job_id': job_id
         }), 202
+    except RequestEntityTooLarge:
+        return jsonify({'error': 'Upload exceeds the maximum allowed size.'}), 413
     except Exception as e:
         logger.error(f"Error handling monograph upload request: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    if redis_conn is None: return jsonify({'error': 'Job tracking requires REDIS_URL'}), 503
+    try:
+        job = Job.fetch(job_id, connection=redis_conn)
+    except NoSuchJobError:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify({'job_id': job.id, 'status': job.get_status(), 'result': job.result, 'enqueued_at': job.enqueued_at.isoformat() if job.enqueued_at else None, 'ended_at': job.ended_at.isoformat() if job.ended_at else None})
+
 @app.route('/api/analyze-product', methods=['POST'])
 def analyze_product():
     try:
-        if 'files' not in request.files: return jsonify({'error': 'No product files provided'}), 400
-        files, analysis_results = request.files.getlist('files'), []
-        for file in files:
-            if not file.filename or not allowed_file(file.filename): continue
-            filename = secure_filename(file.filename)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-            
+        if request.mimetype != 'multipart/form-data': return jsonify({'error': 'No product files provided'}), 400
+        upload = stream_pdf_uploads(app.config['UPLOAD_FOLDER'])
+        if not upload.part_count: return jsonify({'error': 'No product files provided'}), 400
+        sync_knowledge_base()
+        analysis_results = []
+        for filename, filepath in upload.saved_files:
             product_text = pdf_processor.extract_text_from_pdf(filepath)
 
             if not product_text:
@@ -118,15 +208,18 @@ def analyze_product():
             
             ingredients = pdf_processor.extract_ingredients(product_text)
             ingredient_analyses = []
-            for ingredient in ingredients:
-                classification = rag_processor.classify_ingredient(ingredient)
+            classifications = rag_processor.classify_ingredients_batch(ingredients)
+            for ingredient, classification in zip(ingredients, classifications):
                 ingredient_analyses.append({'name': ingredient['name'],'amount': ingredient.get('amount', 'N/A'),'type': ingredient['type'],'classification': classification,'confidence_score': classification.get('confidence', 0)})
             
             analysis = {'filename': filename,'total_ingredients': len(ingredients),'medicinal_ingredients': [ing for ing in ingredient_analyses if ing['type'] == 'medicinal'],'non_medicinal_ingredients': [ing for ing in ingredient_analyses if ing['type'] == 'non_medicinal'],'summary': generate_analysis_summary(ingredient_analyses)}
             analysis_results.append(analysis)
             os.remove(filepath)
             
+        rag_processor.flush_cache()
         return jsonify({'message': 'Analysis completed successfully', 'analyses': analysis_results})
+    except RequestEntityTooLarge:
+        return jsonify({'error': 'Upload exceeds the maximum allowed size.'}), 413
     except Exception as e:
         logger.error(f"Error analyzing product: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
@@ -144,12 +237,14 @@ def generate_analysis_summary(ingredient_analyses):
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
+    sync_knowledge_base()
     return jsonify({'status': 'healthy','rag_initialized': rag_processor.is_initialized(),'monographs_loaded': rag_processor.get_document_count()})
 
 @app.route('/api/reset-database', methods=['POST'])
 def reset_database():
     try:
         rag_processor.reset_knowledge_base()
+        if redis_conn is not None: announce_knowledge_base_change(redis_conn)
         return jsonify({'message': 'Database reset successfully'})
     except Exception as e: return jsonify({'error': str(e)}), 500
 
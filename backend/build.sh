@@ -4,7 +4,7 @@ set -o errexit
 
 # Install system dependencies
 apt-get update
-apt-get install -y tesseract-ocr poppler-utils
+apt-get install -y tesseract-ocr poppler-utils libtesseract-dev libleptonica-dev pkg-config
 
 # --- THIS IS THE FIX ---
 # Upgrade pip and its tools first
@@ -3,7 +3,7 @@ set -e
 
 # Install system dependencies
 apt-get update
-apt-get install -y tesseract-ocr poppler-utils
+apt-get install -y tesseract-ocr poppler-utils libtesseract-dev libleptonica-dev pkg-config
 
 # Install Python dependencies
 pip install -r requirements.txt
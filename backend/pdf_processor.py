@@ -6,8 +6,14 @@ import os
 import logging
 from typing import List, Dict, Optional
 import shutil
+import hashlib
+import atexit
+import threading
+import tempfile
+import importlib.util
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from PIL import Image
-import io
 
 try:
     import pytesseract
@@ -17,117 +23,351 @@ except ImportError:
     pytesseract = None
     print("Warning: pytesseract not available. OCR functionality will be limited.")
 
+# tesserocr is imported on first use (see _get_tess_api), not here: libgomp, which libtesseract
+# loads, reads OMP_THREAD_LIMIT only once, at load time, and OCR pool workers set it before that.
+TESSEROCR_AVAILABLE = importlib.util.find_spec('tesserocr') is not None
+tesserocr = None
+
+# Resolved once per process rather than on every PDFProcessor instantiation
+_TESSERACT_CMD = shutil.which('tesseract') if TESSERACT_AVAILABLE else None
+
+# OCR only pages that carry little extractable text AND are mostly covered by raster images.
+# Tesseract ignores colour, so pages are rendered as 8-bit grayscale at a reduced DPI.
+OCR_DPI = 200
+OCR_MIN_TEXT_CHARS = 150
+OCR_MIN_IMAGE_COVERAGE = 0.3
+# Without tesserocr, pages are OCRed through one Tesseract run per image list of at most this size
+OCR_LIST_MAX_IMAGES = 100
+# Ingredient parsers only look at this much of a document; a safety net for the lazy section
+# patterns below against pathological (or adversarial) text
+PARSER_MAX_CHARS = 200_000
+
+# Part of every text cache key; bump it whenever a change to extraction or OCR alters the text
+# produced, so results cached by an earlier version are not served
+TEXT_CACHE_VERSION = 2
+
+# Precompiled patterns for the parsers below; several run once per line of a document
+# The formulation block is located with three literal searches rather than one
+# 'FORMULATION:.*?EACH TABLET CONTAINS:(.*?)' pattern, which rescanned to the end of the
+# text from every 'FORMULATION:' and went quadratic when the second marker was missing.
+_RE_FORMULATION_START = re.compile(r'FORMULATION:', re.IGNORECASE)
+_RE_FORMULATION_CONTENT = re.compile(r'EACH TABLET CONTAINS:', re.IGNORECASE)
+_RE_FORMULATION_END = re.compile(r'Total weight:', re.IGNORECASE)
+_RE_ACTIVE_SECTION = re.compile(r'Active Ingredients:(.*?)(?=Inactive Ingredients:|\Z)', re.IGNORECASE | re.DOTALL)
+_RE_INACTIVE_SECTION = re.compile(r'Inactive Ingredients:(.*)', re.IGNORECASE | re.DOTALL)
+_RE_SECTION8 = re.compile(r'Section 8 - Origin and Composition\n(.*?)(?=\n\n|\Z)', re.IGNORECASE | re.DOTALL)
+_RE_SPLIT_2SP = re.compile(r'\s{2,}')
+# Greedy up to the next '(' with no trailing \s*. The group cannot start with whitespace, so
+# \s+ and the group never compete for the same whitespace run (that split went quadratic).
+# Only its first character may be '(', as in 'Item Name (as citrate) (': the old lazy group
+# also stopped at the first '(' after its start.
+_RE_INSPECTION_ITEM = re.compile(r'Item Name\s+([\w()\-,][\w\s)\-,]*)\(', re.IGNORECASE)
+_RE_COA_FIELD = re.compile(r'(?:Product Name|Material Description|ITEM DESCRIPTION|Common or Usual Name)[ \t]*[:\-]?[ \t]*([^\n]*)', re.IGNORECASE)
+# Captures the first non-blank line after a title line; the lookahead leaves that line
+# unconsumed so it can still be matched as a title itself.
+_RE_GENERIC_TITLE_NEXT = re.compile(r'^[^\n]*(?:CERTIFICATE OF ANALYSIS|STANDARD INFORMATION ON DIETARY INGREDIENT)[^\n]*(?=\s*([^\n]*))', re.IGNORECASE | re.MULTILINE)
+_RE_PAREN_CONTINUATION = re.compile(r'^\([\w\s®]+\)$')
+_RE_TABLE_NUMERIC = re.compile(r'\s+\d+\.\d+.*')
+_RE_BLANK = re.compile(r'\n\s*\n')
+# One pass over an ingredient name: spec parentheses (NLT/percent), brand and unit noise words,
+# long numeric codes, and stray punctuation. Alternatives are tried in that order at each position.
+_RE_CLEAN_NAME = re.compile(
+    r'\s*\(NLT[^)\n]*\)'
+    r'|\s*\(\d{1,3}(?:\.\d+)?%\s*[^)\n]*\)'
+    r'|\b(?:PharmaPure|MenaQ7|ppm|Oil|G\)|Evyap|WONF)\b'
+    r'|\s*\d{4,}'
+    r'|[,\*:]',
+    re.IGNORECASE)
+
+# Parsers in priority order, each with the lowercase phrases one of which must appear for it to
+# match. Plain substring checks on the lowercased text are used rather than a single named-group
+# alternation: on real monographs CPython's re takes ~15x longer to scan for the same phrases.
+_PARSER_FINGERPRINTS = (
+    ('_parse_formulation_document', ('each tablet contains:',)),
+    ('_parse_composition_statement', ('section 8 - origin and composition',)),
+    ('_parse_inspection_form', ('item name',)),
+    ('_parse_coa_and_sidi', ('product name', 'material description', 'item description', 'common or usual name')),
+    ('_parse_generic_document', ('certificate of analysis', 'standard information on dietary ingredient')),
+)
+
+_tess_local = threading.local()
+
+def _get_tess_api():
+    """
+    Returns a long-lived tesserocr API for the current thread, so the language model is
+    loaded once per worker instead of once per page. PyTessBaseAPI is not thread-safe.
+    """
+    global tesserocr, TESSEROCR_AVAILABLE
+    api = getattr(_tess_local, 'api', None)
+    if api is None:
+        try:
+            import tesserocr
+        except ImportError:  # installed but unloadable (e.g. libtesseract missing); use pytesseract
+            TESSEROCR_AVAILABLE = False
+            return None
+        api = tesserocr.PyTessBaseAPI(lang='eng', psm=tesserocr.PSM.AUTO)
+        atexit.register(api.End)
+        _tess_local.api = api
+    return api
+
+def _render_for_ocr(page):
+    return page.get_pixmap(dpi=OCR_DPI, colorspace=fitz.csGRAY, alpha=False)
+
+def _ocr_page(page) -> str:
+    """Renders a single page to grayscale and OCRs it."""
+    return _ocr_pixmap(_render_for_ocr(page))
+
+def _ocr_pixmap(pix) -> str:
+    api = _get_tess_api() if TESSEROCR_AVAILABLE else None
+    if api is not None:
+        api.SetImageBytes(pix.samples, pix.width, pix.height, 1, pix.stride)
+        return api.GetUTF8Text().strip()
+    # Wrap the raw pixmap samples directly; no PNG encode/decode round-trip
+    img = Image.frombytes("L", (pix.width, pix.height), pix.samples)
+    return pytesseract.image_to_string(img, lang='eng').strip()
+
+def _ocr_page_list(doc, page_nums: List[int]) -> List[str]:
+    """
+    OCRs several pages in order. pytesseract starts a Tesseract process (and reloads the language
+    model) per call, so the pages are written out as uncompressed PGMs and passed to a single run
+    as an image list file; Tesseract separates the pages of its output with form feeds.
+    """
+    if len(page_nums) <= 1: return [_ocr_page(doc[page_num]) for page_num in page_nums]
+    if TESSEROCR_AVAILABLE: return _ocr_page_pipeline(doc, page_nums)
+    texts = []
+    for start in range(0, len(page_nums), OCR_LIST_MAX_IMAGES):
+        batch = page_nums[start:start + OCR_LIST_MAX_IMAGES]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            image_paths = []
+            for page_num in batch:
+                image_path = os.path.join(tmp_dir, f'page-{page_num}.pgm')
+                _render_for_ocr(doc[page_num]).save(image_path)
+                image_paths.append(image_path)
+            list_path = os.path.join(tmp_dir, 'pages.txt')
+            with open(list_path, 'w') as f: f.write('\n'.join(image_paths) + '\n')
+            pages = pytesseract.image_to_string(list_path, lang='eng').split('\f')
+        # Depending on the Tesseract version the separator also trails the last page
+        if len(pages) == len(batch) + 1 and not pages[-1].strip(): pages.pop()
+        if len(pages) != len(batch): pages = [_ocr_page(doc[page_num]) for page_num in batch]
+        texts.extend(page.strip() for page in pages)
+    return texts
+
+def _ocr_page_pipeline(doc, page_nums: List[int]) -> List[str]:
+    """
+    tesserocr releases the GIL while recognizing, so the next page is rendered on a helper thread
+    while the current one is OCRed. At most two pixmaps are alive at a time; the document itself is
+    only ever touched by one thread at once, since the helper is idle whenever pages are looked up.
+    """
+    texts = []
+    with ThreadPoolExecutor(max_workers=1) as renderer:
+        next_pix = renderer.submit(_render_for_ocr, doc[page_nums[0]])
+        for i in range(len(page_nums)):
+            pix = next_pix.result()
+            if i + 1 < len(page_nums): next_pix = renderer.submit(_render_for_ocr, doc[page_nums[i + 1]])
+            texts.append(_ocr_pixmap(pix))
+    return texts
+
+_OCR_MP_CONTEXT = multiprocessing.get_context('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+
+# Document held open by each OCR pool worker for the lifetime of the pool
+_worker_doc = None
+
+def _init_ocr_worker(pdf_bytes: bytes):
+    """Pool initializer: each worker receives the PDF bytes once and parses them once."""
+    global _worker_doc
+    # Pages are already spread across processes; keep each Tesseract single-threaded so its OpenMP
+    # pool does not oversubscribe the cores the other workers are using. Set before tesserocr is
+    # first imported in this (fresh) process, and inherited by pytesseract's Tesseract subprocesses.
+    # Inline OCR in the web and RQ processes keeps Tesseract's default threading.
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+    _worker_doc = fitz.open(stream=pdf_bytes, filetype='pdf')
+
+def _ocr_worker_pages(page_nums: List[int]) -> List[str]:
+    return _ocr_page_list(_worker_doc, page_nums)
+
 class PDFProcessor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        # Extracted text keyed by the SHA-256 of the PDF bytes, so re-uploads skip OCR
+        self.text_cache_dir = './data/processed/.cache'
         self._find_tesseract()
 
     def _find_tesseract(self):
-        if not TESSERACT_AVAILABLE: return
-        tesseract_path = shutil.which('tesseract')
-        if tesseract_path:
-            pytesseract.pytesseract.tesseract_cmd = tesseract_path
-            self.logger.info(f"Using Tesseract from PATH: {tesseract_path}")
-
-    def extract_text_from_pdf(self, pdf_path: str) -> Optional[str]:
-        full_text = ""
+        if _TESSERACT_CMD:
+            pytesseract.pytesseract.tesseract_cmd = _TESSERACT_CMD
+            self.logger.info(f"Using Tesseract from PATH: {_TESSERACT_CMD}")
+
+    def extract_text_from_pdf(self, pdf_path: str, preserve_layout: bool = True, max_pages: Optional[int] = None) -> Optional[str]:
+        """
+        preserve_layout keeps PyMuPDF's sorted, space-padded line layout that the ingredient table
+        parsers rely on. It is an order of magnitude slower, so callers that only need the words
+        (e.g. knowledge-base ingestion) should pass False. max_pages limits extraction (and OCR)
+        to the first pages of the document, e.g. for smoke tests.
+        """
+        try:
+            with open(pdf_path, 'rb') as f: pdf_bytes = f.read()
+        except OSError as e:
+            self.logger.error(f"Failed to read PDF '{pdf_path}': {str(e)}")
+            return None
+        cache_key = f'v{TEXT_CACHE_VERSION}-' + hashlib.sha256(pdf_bytes).hexdigest() + ('' if preserve_layout else '-plain') + ('' if max_pages is None else f'-p{max_pages}')
+        cache_path = os.path.join(self.text_cache_dir, cache_key + '.txt')
+        if os.path.exists(cache_path):
+            self.logger.info(f"Found extracted text for '{pdf_path}' in cache.")
+            with open(cache_path, 'r', encoding='utf-8') as f: return f.read()
+
+        text = self._extract_text(pdf_bytes, pdf_path, preserve_layout, max_pages)
+        if text is not None: self._save_text_cache(cache_path, text)
+        return text
+
+    def _save_text_cache(self, cache_path: str, text: str):
         try:
-            doc = fitz.open(pdf_path)
-            for page_num, page in enumerate(doc):
-                page_text = page.get_text("text", sort=True).strip()
-                if len(page_text) < 150:
-                    self.logger.info(f"Page {page_num+1} seems image-based, using OCR.")
-                    pix = page.get_pixmap(dpi=300)
-                    img = Image.open(io.BytesIO(pix.tobytes("png")))
-                    ocr_text = pytesseract.image_to_string(img, lang='eng').strip()
-                    if ocr_text: page_text = ocr_text
-                full_text += page_text + "\n\n"
-            doc.close()
-            return self._clean_text(full_text)
+            os.makedirs(self.text_cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f: f.write(text)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            self.logger.warning(f"Could not write text cache '{cache_path}': {str(e)}")
+
+    def _extract_text(self, pdf_bytes: bytes, pdf_path: str, preserve_layout: bool, max_pages: Optional[int] = None) -> Optional[str]:
+        try:
+            with fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+                pages = [doc[page_num] for page_num in range(doc.page_count if max_pages is None else min(max_pages, doc.page_count))]
+                # One text pass per page; its length also drives the OCR decision below
+                page_texts = [page.get_text("text", sort=preserve_layout).strip() for page in pages]
+                if self._is_born_digital(pages, page_texts):
+                    self.logger.info(f"'{pdf_path}' is born-digital, skipping OCR.")
+                    return self._clean_text("\n\n".join(page_texts))
+
+                ocr_page_nums = []
+                for page_num, page in enumerate(pages):
+                    if self._needs_ocr(page, page_texts[page_num]):
+                        self.logger.info(f"Page {page_num+1} seems image-based, using OCR.")
+                        ocr_page_nums.append(page_num)
+                for page_num, ocr_text in zip(ocr_page_nums, self._ocr_pages(doc, pdf_bytes, ocr_page_nums)):
+                    if ocr_text: page_texts[page_num] = ocr_text
+
+            return self._clean_text("\n\n".join(page_texts))
         except Exception as e:
             self.logger.error(f"Failed to process PDF '{pdf_path}': {str(e)}", exc_info=True)
             return None
 
+    def _ocr_pages(self, doc, pdf_bytes: bytes, page_nums: List[int]) -> List[str]:
+        """
+        OCRs the given pages, fanning them out across processes since Tesseract is CPU-bound.
+        Each worker takes a contiguous run of pages. Results are returned in the same order as page_nums.
+        """
+        if len(page_nums) <= 1: return [_ocr_page(doc[page_num]) for page_num in page_nums]
+        max_workers = min(os.cpu_count() or 1, len(page_nums))
+        if max_workers == 1: return _ocr_page_list(doc, page_nums)
+        run_length = -(-len(page_nums) // max_workers)
+        runs = [page_nums[start:start + run_length] for start in range(0, len(page_nums), run_length)]
+        # Workers must not be forked from this process: gunicorn's gthread workers and the RQ worker
+        # already run threads and have torch/OpenMP loaded, and a fork in that state can deadlock.
+        # forkserver starts each worker from a small single-threaded server process instead.
+        with ProcessPoolExecutor(max_workers=len(runs), mp_context=_OCR_MP_CONTEXT, initializer=_init_ocr_worker, initargs=(pdf_bytes,)) as executor:
+            return [text for run_texts in executor.map(_ocr_worker_pages, runs) for text in run_texts]
+
+    def _is_born_digital(self, pages, page_texts: List[str]) -> bool:
+        """
+        Document-level check run before any per-page OCR decision: a PDF with no raster
+        images, or with enough native text on every page, never needs Tesseract. A total-text
+        threshold is not enough, since it would skip a scanned page inside a digital monograph.
+        """
+        if all(len(page_text) >= OCR_MIN_TEXT_CHARS for page_text in page_texts): return True
+        return not any(page.get_images() for page in pages)
+
+    def _needs_ocr(self, page, page_text: str) -> bool:
+        """
+        A page needs OCR when it has little extractable text and raster images cover
+        a large share of it. Short text-only pages (titles, TOCs) are left alone.
+        """
+        if len(page_text) >= OCR_MIN_TEXT_CHARS: return False
+        page_rect = page.rect
+        page_area = page_rect.width * page_rect.height
+        if not page_area: return False
+        image_area = 0.0
+        for info in page.get_image_info():
+            bbox = fitz.Rect(info['bbox']) & page_rect
+            if not bbox.is_empty: image_area += bbox.width * bbox.height
+        return image_area / page_area > OCR_MIN_IMAGE_COVERAGE
+
     def extract_ingredients(self, text: str) -> List[Dict]:
         if not text: return []
-        parsing_strategies = [
-            self._parse_formulation_document,
-            self._parse_composition_statement,
-            self._parse_inspection_form,
-            self._parse_coa_and_sidi,
-            self._parse_generic_document
-        ]
-        for strategy in parsing_strategies:
-            ingredients = strategy(text)
+        if len(text) > PARSER_MAX_CHARS:
+            self.logger.warning(f"Parsing only the first {PARSER_MAX_CHARS} of {len(text)} characters.")
+            text = text[:PARSER_MAX_CHARS]
+        # Each parser needs one of its fingerprints to be present; skip the ones that cannot match
+        # with a cheap substring check instead of letting their regexes scan the whole document.
+        text_lower = text.lower()
+        for parser_name, fingerprints in _PARSER_FINGERPRINTS:
+            if not any(fingerprint in text_lower for fingerprint in fingerprints): continue
+            ingredients = getattr(self, parser_name)(text)
             if ingredients:
-                self.logger.info(f"Successfully extracted ingredients using strategy: {strategy.__name__}")
-                return self._remove_duplicates(ingredients)
+                self.logger.info(f"Successfully extracted {len(ingredients)} unique ingredients using strategy: {parser_name}")
+                return ingredients
         self.logger.warning("All parsing strategies failed. No ingredients found.")
         return []
 
     # --- FINAL, MOST ROBUST PARSERS ---
 
     def _parse_formulation_document(self, text: str) -> List[Dict]:
-        content_match = re.search(r'FORMULATION:.*?EACH TABLET CONTAINS:(.*?)(?=Total weight:|\Z)', text, re.IGNORECASE | re.DOTALL)
-        if not content_match: return []
+        content = self._formulation_content(text)
+        if content is None: return []
         
-        content = content_match.group(1)
-        active_section_match = re.search(r'Active Ingredients:(.*?)(?=Inactive Ingredients:|\Z)', content, re.IGNORECASE | re.DOTALL)
-        inactive_section_match = re.search(r'Inactive Ingredients:(.*)', content, re.IGNORECASE | re.DOTALL)
+        active_section_match = _RE_ACTIVE_SECTION.search(content)
+        inactive_section_match = _RE_INACTIVE_SECTION.search(content)
         
-        ingredients = []
+        ingredients, seen = [], set()
         if active_section_match:
             lines = self._process_section_lines(active_section_match.group(1))
             for line in lines:
-                name = self._get_name_from_table_line(line)
-                if name: ingredients.append({'name': name, 'type': 'medicinal'})
+                self._append_unique(ingredients, seen, self._get_name_from_table_line(line), 'medicinal')
 
         if inactive_section_match:
             lines = self._process_section_lines(inactive_section_match.group(1))
             for line in lines:
-                name = self._get_name_from_table_line(line)
-                if name: ingredients.append({'name': name, 'type': 'non_medicinal'})
+                self._append_unique(ingredients, seen, self._get_name_from_table_line(line), 'non_medicinal')
         return ingredients
 
+    @staticmethod
+    def _formulation_content(text: str) -> Optional[str]:
+        """Text between 'EACH TABLET CONTAINS:' (after 'FORMULATION:') and 'Total weight:' or the end."""
+        start = _RE_FORMULATION_START.search(text)
+        if not start: return None
+        content_start = _RE_FORMULATION_CONTENT.search(text, start.end())
+        if not content_start: return None
+        end = _RE_FORMULATION_END.search(text, content_start.end())
+        return text[content_start.end():end.start() if end else len(text)]
+
     def _parse_composition_statement(self, text: str) -> List[Dict]:
-        composition_match = re.search(r'Section 8 - Origin and Composition\n(.*?)(?=\n\n|\Z)', text, re.IGNORECASE | re.DOTALL)
+        composition_match = _RE_SECTION8.search(text)
         if not composition_match: return []
-        ingredients = []
+        ingredients, seen = [], set()
         lines = composition_match.group(1).strip().split('\n')
         for line in lines[1:]:
-            parts = re.split(r'\s{2,}', line)
-            if parts:
-                name = self._clean_ingredient_name(parts[0])
-                if name: ingredients.append({'name': name, 'type': 'medicinal'})
+            parts = _RE_SPLIT_2SP.split(line)
+            if parts: self._append_unique(ingredients, seen, self._clean_ingredient_name(parts[0]), 'medicinal')
         return ingredients
         
     def _parse_inspection_form(self, text: str) -> List[Dict]:
-        match = re.search(r'Item Name\s+([\w\s\(\)\- mcg,]+?)\s*\(', text, re.IGNORECASE)
+        match = _RE_INSPECTION_ITEM.search(text)
         if match:
-            name = self._clean_ingredient_name(match.group(1))
+            name = self._clean_ingredient_name(match.group(1).rstrip())
             if name: return [{'name': name, 'type': 'medicinal'}]
         return []
 
     def _parse_coa_and_sidi(self, text: str) -> List[Dict]:
-        keywords = ['Product Name', 'Material Description', 'ITEM DESCRIPTION', 'Common or Usual Name']
-        for line in text.split('\n'):
-            for keyword in keywords:
-                if keyword.lower() in line.lower():
-                    parts = re.split(r':|{}'.format(re.escape(keyword)), line, maxsplit=1, flags=re.IGNORECASE)
-                    if len(parts) > 1:
-                        name = self._clean_ingredient_name(parts[1])
-                        if name: return [{'name': name, 'type': 'medicinal'}]
+        # The first field label whose value cleans to a usable name wins
+        for match in _RE_COA_FIELD.finditer(text):
+            name = self._clean_ingredient_name(match.group(1))
+            if name: return [{'name': name, 'type': 'medicinal'}]
         return []
 
     def _parse_generic_document(self, text: str) -> List[Dict]:
-        title_patterns = ['CERTIFICATE OF ANALYSIS', 'STANDARD INFORMATION ON DIETARY INGREDIENT']
-        for line in text.split('\n'):
-            if any(title.lower() in line.lower() for title in title_patterns):
-                try:
-                    next_line = text.split(line)[1].strip().split('\n')[0]
-                    name = self._clean_ingredient_name(next_line)
-                    if name: return [{'name': name, 'type': 'medicinal'}]
-                except IndexError: continue
+        # One regex scan yields each title line together with the line that follows it
+        for title_match in _RE_GENERIC_TITLE_NEXT.finditer(text):
+            name = self._clean_ingredient_name(title_match.group(1))
+            if name: return [{'name': name, 'type': 'medicinal'}]
         return []
         
     # --- FINAL, MOST ROBUST HELPER FUNCTIONS ---
@@ -146,7 +386,7 @@ class PDFProcessor:
             
             # Check if this line is a continuation of the previous line
             # (e.g., starts with a lowercase letter or is a single word in parentheses)
-            if (processed_lines and (line[0].islower() or re.match(r'^\([\w\s®]+\)$', line))):
+            if (processed_lines and (line[0].islower() or _RE_PAREN_CONTINUATION.match(line))):
                 processed_lines[-1] += " " + line # Append to the previous line
             else:
                 processed_lines.append(line)
@@ -157,34 +397,23 @@ class PDFProcessor:
         Extracts the name from a table line by stripping off the numeric columns.
         """
         # Remove the numeric columns (mg/Tablet, % by Weight) from the right side
-        name = re.sub(r'\s+\d+\.\d+.*', '', line).strip()
+        name = _RE_TABLE_NUMERIC.sub('', line).strip()
         return self._clean_ingredient_name(name)
 
     def _clean_text(self, text: str) -> str:
-        return re.sub(r'\n\s*\n', '\n\n', text).strip()
+        return _RE_BLANK.sub('\n\n', text).strip()
 
     def _clean_ingredient_name(self, name: str) -> Optional[str]:
         if not name: return None
-        name = name.strip()
-        # Clean specific technical specs more carefully
-        name = re.sub(r'\s*\(NLT.*?\)', '', name, flags=re.IGNORECASE).strip()
-        name = re.sub(r'\s*\(\d{1,3}(\.\d+)?%\s*.*?\)', '', name).strip()
-        
-        # General cleanup
-        name = re.sub(r'\b(PharmaPure|MenaQ7|ppm|Oil|G\)|Evyap|WONF)\b', '', name, flags=re.IGNORECASE)
-        name = re.sub(r'\s*\d{4,}', '', name)
-        name = re.sub(r'[,\*:]', '', name).strip()
-        
+        # Removing a noise word next to a number or spec can leave two spaces behind; collapse them
+        name = ' '.join(_RE_CLEAN_NAME.sub('', name).split())
         if len(name.split()) > 7 or len(name) < 3: return None
         return name
 
-    def _remove_duplicates(self, ingredients: List[Dict]) -> List[Dict]:
-        unique, seen_names = [], set()
-        for ingredient in ingredients:
-            if ingredient and ingredient.get('name'):
-                name_lower = ingredient['name'].lower().strip()
-                if name_lower and name_lower not in seen_names:
-                    unique.append(ingredient)
-                    seen_names.add(name_lower)
-        self.logger.info(f"Successfully removed duplicates. Final count: {len(unique)} ingredients.")
-        return unique
\ No newline at end of file
+    def _append_unique(self, ingredients: List[Dict], seen: set, name: Optional[str], ingredient_type: str):
+        """Appends a cleaned name unless an earlier one matched it case-insensitively; the first wins."""
+        if not name: return
+        key = name.casefold()
+        if key in seen: return
+        seen.add(key)
+        ingredients.append({'name': name, 'type': ingredient_type})
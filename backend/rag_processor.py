@@ -1,20 +1,62 @@
 import os
 import json
+import atexit
+import hashlib
 import logging
-from typing import List, Dict, Any
-import chromadb
-from sentence_transformers import SentenceTransformer
-import google.generativeai as genai
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+import numpy as np
 from dotenv import load_dotenv
 import re
 
 load_dotenv()
 
+# Near-duplicate ingredient names (cosine similarity of their embeddings) reuse a cached classification
+SEMANTIC_CACHE_THRESHOLD = 0.97
+SEMANTIC_CACHE_SIZE = 512
+EMBEDDING_CACHE_SIZE = 4096
+SEARCH_CACHE_SIZE = 1024
+# Chunks per forward pass when embedding monographs for the knowledge base
+EMBEDDING_BATCH_SIZE = 128
+# Monograph text files read and chunked concurrently while (re)building the knowledge base
+READ_MAX_WORKERS = 16
+
+# Embeddings are stored unit-normalized, so inner product equals cosine similarity and HNSW
+# can skip the per-comparison norm computation that 'l2'/'cosine' spaces need.
+COLLECTION_NAME = "nhp_monographs"
+COLLECTION_METADATA = {"hnsw:space": "ip"}
+
+# Ingredients still needing Gemini after the caches are classified this many to a prompt
+GEMINI_BATCH_SIZE = 10
+# Gemini calls are network-bound, so several batch prompts can be in flight at once
+GEMINI_MAX_WORKERS = 8
+NO_CONTEXT_TEXT = "No specific monograph information was found."
+
+_RE_JSON_FENCE = re.compile(r"```json\s*(\{.*?\}|\[.*?\])\s*```", re.DOTALL)
+
 class RAGProcessor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.chroma_client = chromadb.PersistentClient(path=os.environ.get('CHROMA_DB_PATH', './data/embeddings'))
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+        # Imported here rather than at module level: torch, chromadb and the Gemini client take
+        # seconds to load, and only code that actually builds a RAGProcessor needs them.
+        import torch
+        import chromadb
+        from sentence_transformers import SentenceTransformer
+        import google.generativeai as genai
+
+        chroma_host = os.environ.get('CHROMA_HOST')
+        if chroma_host:
+            # Client/server mode: the web processes and the RQ worker share one Chroma server. Each
+            # PersistentClient keeps its own in-memory HNSW index, so it would not see other processes' writes.
+            self.chroma_client = chromadb.HttpClient(host=chroma_host, port=int(os.environ.get('CHROMA_PORT', 8000)))
+        else:
+            self.chroma_client = chromadb.PersistentClient(path=os.environ.get('CHROMA_DB_PATH', './data/embeddings'))
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2', device=device)
+        # Half precision doubles GPU throughput; on CPU FP16 matmuls are slower, so stay in FP32 there
+        if device == 'cuda': self.embedding_model.half()
         
         # Check for API key before configuring Gemini
         api_key = os.environ.get('GEMINI_API_KEY')
@@ -26,36 +68,205 @@ class RAGProcessor:
             self.gemini_model = genai.GenerativeModel('gemini-1.5-flash')
         self.cache_path = './data/analysis_cache.json'
         self.cache = self._load_cache()
-        try:
-            self.collection = self.chroma_client.get_collection("nhp_monographs")
-        except Exception:
-            self.collection = self.chroma_client.create_collection(name="nhp_monographs")
+        # Classifications are written back in one go by flush_cache rather than after every miss
+        self._dirty = False
+        atexit.register(self.flush_cache)
+        # Guards the in-memory caches below; gunicorn gthread workers share this instance across threads
+        self._cache_lock = threading.RLock()
+        self.embedding_cache_path = './data/embedding_cache.npz'
+        self._embedding_cache = self._load_embedding_cache()
+        atexit.register(self._save_embedding_cache)
+        # RAG results per (name, n_results); only valid for the collection size they were computed against
+        self._search_cache = OrderedDict()
+        self._search_cache_count = None
+        # Embeddings of recently classified names, rows aligned with _semantic_keys
+        self._semantic_keys, self._semantic_matrix = None, None
+        self.collection = self.chroma_client.get_or_create_collection(name=COLLECTION_NAME, metadata=COLLECTION_METADATA)
+
+    def refresh_collection(self):
+        """Re-fetches the collection handle and drops cached searches after another process changed the knowledge base."""
+        collection = self.chroma_client.get_or_create_collection(name=COLLECTION_NAME, metadata=COLLECTION_METADATA)
+        with self._cache_lock:
+            self.collection = collection
+            self._search_cache.clear()
+            self._search_cache_count = None
 
     def _load_cache(self) -> Dict:
         if os.path.exists(self.cache_path):
             with open(self.cache_path, 'r') as f: return json.load(f)
         return {}
 
-    def _save_cache(self):
-        with open(self.cache_path, 'w') as f: json.dump(self.cache, f, indent=2)
+    def flush_cache(self):
+        """Writes the classification cache to disk if it changed since the last flush."""
+        with self._cache_lock:
+            if not self._dirty: return
+            try:
+                tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as f: json.dump(self.cache, f, indent=2)
+                os.replace(tmp_path, self.cache_path)
+                self._dirty = False
+            except Exception as e:
+                self.logger.warning(f"Could not save analysis cache: {e}")
+
+    def _load_embedding_cache(self) -> OrderedDict:
+        try:
+            with np.load(self.embedding_cache_path) as data:
+                return OrderedDict(zip(data['keys'].tolist(), data['vectors']))
+        except FileNotFoundError:
+            return OrderedDict()
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable embedding cache: {e}")
+            return OrderedDict()
+
+    def _save_embedding_cache(self):
+        with self._cache_lock:
+            if not self._embedding_cache: return
+            keys, vectors = list(self._embedding_cache.keys()), list(self._embedding_cache.values())
+        try:
+            # Written beside the cache and swapped in, like flush_cache: every gunicorn worker and the
+            # RQ worker save at exit, and a reader must never see a half-written file
+            tmp_path = f"{self.embedding_cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f: np.savez(f, keys=np.array(keys), vectors=np.stack(vectors))
+            os.replace(tmp_path, self.embedding_cache_path)
+        except Exception as e:
+            self.logger.warning(f"Could not save embedding cache: {e}")
+
+    @staticmethod
+    def _cache_key(name: str) -> str:
+        return name.casefold().strip()
+
+    def _embed_names(self, names: List[str]) -> np.ndarray:
+        """Returns unit-normalized name embeddings, encoding only names not seen before."""
+        keys = [self._cache_key(name) for name in names]
+        with self._cache_lock:
+            vectors = {key: self._embedding_cache[key] for key in keys if key in self._embedding_cache}
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if missing:
+            vectors.update(zip(missing, self.embedding_model.encode(missing, batch_size=32, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)))
+        with self._cache_lock:
+            for key in keys:
+                self._embedding_cache[key] = vectors[key]
+                self._embedding_cache.move_to_end(key)
+            while len(self._embedding_cache) > EMBEDDING_CACHE_SIZE: self._embedding_cache.popitem(last=False)
+        return np.stack([vectors[key] for key in keys])
+
+    def _semantic_lookup(self, name: str) -> Optional[Dict]:
+        """Finds a cached classification for a near-identical ingredient name."""
+        with self._cache_lock:
+            if self._semantic_keys is None:
+                recent = list(self.cache.keys())[-SEMANTIC_CACHE_SIZE:]
+                self._semantic_keys = recent
+                self._semantic_matrix = self._embed_names(recent) if recent else None
+            semantic_keys, semantic_matrix = self._semantic_keys, self._semantic_matrix
+        if semantic_matrix is None: return None
+        similarities = semantic_matrix @ self._embed_names([name])[0]
+        best = int(np.argmax(similarities))
+        if similarities[best] < SEMANTIC_CACHE_THRESHOLD: return None
+        self.logger.info(f"'{name}' matches cached '{semantic_keys[best]}' (similarity {similarities[best]:.3f}).")
+        return self.cache.get(semantic_keys[best])
+
+    def _should_remember_semantic(self, name: str) -> bool:
+        with self._cache_lock: return self._semantic_keys is not None and name not in self._semantic_keys
+
+    def _remember_semantic(self, name: str):
+        # Without an index yet, it will include this name when built. A name already in the window
+        # points at the cache entry just updated; adding it again would only push other names out.
+        if not self._should_remember_semantic(name): return
+        vector = self._embed_names([name])
+        with self._cache_lock:
+            if not self._should_remember_semantic(name): return
+            # Rebind rather than mutate so readers holding the previous (keys, matrix) pair stay consistent
+            self._semantic_keys = (self._semantic_keys + [name])[-SEMANTIC_CACHE_SIZE:]
+            matrix = vector if self._semantic_matrix is None else np.vstack([self._semantic_matrix, vector])
+            self._semantic_matrix = matrix[-SEMANTIC_CACHE_SIZE:]
 
     def classify_ingredient(self, ingredient: Dict) -> Dict:
         """Classifies a single ingredient, using a cache to avoid repeated API calls."""
+        similar_docs = self.search_similar_documents(ingredient['name']) if self._needs_rag_search(ingredient) else []
+        return self._classify_with_context(ingredient, similar_docs)
+
+    def classify_ingredients_batch(self, ingredients: List[Dict]) -> List[Dict]:
+        """
+        Classifies a list of ingredients, embedding every RAG query in one encode call and
+        running a single vector search for the whole batch. Ingredients that still need Gemini
+        are sent GEMINI_BATCH_SIZE at a time in a single prompt, with up to GEMINI_MAX_WORKERS
+        prompts running concurrently. Results follow input order.
+        """
+        to_search = [ing['name'] for ing in ingredients if self._needs_rag_search(ing)]
+        docs_by_name = dict(zip(to_search, self.search_similar_documents_batch(to_search)))
+        results, pending_indices, pending = [], [], []
+        for ingredient in ingredients:
+            similar_docs = docs_by_name.get(ingredient['name'], [])
+            context = "\n".join([doc['content'] for doc in similar_docs])
+            context_hash = self._context_hash(context)
+            result = self._resolve_locally(ingredient, similar_docs, context_hash)
+            if result is None:
+                pending_indices.append(len(results))
+                pending.append((ingredient, similar_docs, context, context_hash))
+            results.append(result)
+        batches = [pending[start:start + GEMINI_BATCH_SIZE] for start in range(0, len(pending), GEMINI_BATCH_SIZE)]
+        if len(batches) > 1:
+            with ThreadPoolExecutor(max_workers=min(GEMINI_MAX_WORKERS, len(batches))) as executor:
+                batch_results = list(executor.map(self._classify_with_gemini_batch, batches))
+        else:
+            batch_results = [self._classify_with_gemini_batch(batch) for batch in batches]
+        classified = [result for batch in batch_results for result in batch]
+        for index, result in zip(pending_indices, classified): results[index] = result
+        return results
+
+    def _needs_rag_search(self, ingredient: Dict) -> bool:
+        # Uncached non-medicinal ingredients are classified without consulting the monographs
+        return ingredient['name'] in self.cache or ingredient.get('type') != 'non_medicinal'
+
+    @staticmethod
+    def _context_hash(context: str) -> str:
+        return hashlib.sha256(context.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _from_cache(entry: Dict, monograph_found: bool) -> Dict:
+        # The stored context hash is bookkeeping, not part of the classification
+        result = {key: value for key, value in entry.items() if key != 'context_hash'}
+        result['monograph_found'] = monograph_found
+        return result
+
+    def _classify_with_context(self, ingredient: Dict, similar_docs: List[Dict]) -> Dict:
+        context = "\n".join([doc['content'] for doc in similar_docs])
+        context_hash = self._context_hash(context)
+        result = self._resolve_locally(ingredient, similar_docs, context_hash)
+        if result is not None: return result
+        return self._classify_with_gemini(ingredient, similar_docs, context, context_hash)
+
+    def _resolve_locally(self, ingredient: Dict, similar_docs: List[Dict], context_hash: str) -> Optional[Dict]:
+        """Returns a classification that needs no Gemini call, or None if one is required."""
         name = ingredient['name']
-        
-        if name in self.cache:
+        monograph_found = bool(similar_docs)
+
+        # A cached analysis only stands while the monograph context it was based on is unchanged
+        cached_result = self.cache.get(name)
+        if cached_result is not None and cached_result.get('context_hash') == context_hash:
             self.logger.info(f"Found '{name}' in cache. Using saved analysis.")
-            # Even if cached, we do a fresh RAG search
-            similar_docs = self.search_similar_documents(name)
-            cached_result = self.cache[name]
-            cached_result['monograph_found'] = bool(similar_docs)
-            return cached_result
+            # Even if cached, the monograph lookup reflects the current knowledge base
+            return self._from_cache(cached_result, monograph_found)
             
         if ingredient.get('type') == 'non_medicinal':
             return {"classification_text": "Non-medicinal", "confidence": 0.95, "reasoning": "Identified as a non-medicinal excipient.", "monograph_found": False}
 
-        # --- RAG SEARCH IS NOW DONE INSIDE THIS FUNCTION ---
-        similar_docs = self.search_similar_documents(name)
+        # A near-identical name is only reused when it was classified against the same monographs
+        near_result = self._semantic_lookup(name)
+        if near_result is not None and near_result.get('context_hash') == context_hash:
+            return self._from_cache(near_result, monograph_found)
+        return None
+
+    def _store_classification(self, name: str, result: Dict, monograph_found: bool, context_hash: str) -> Dict:
+        result['monograph_found'] = monograph_found
+        with self._cache_lock:
+            self.cache[name] = {**result, 'context_hash': context_hash}
+            self._dirty = True
+        self._remember_semantic(name)
+        return result
+
+    def _classify_with_gemini(self, ingredient: Dict, similar_docs: List[Dict], context: str, context_hash: str) -> Dict:
+        name = ingredient['name']
         monograph_found = bool(similar_docs)
 
         # Check if Gemini is available
@@ -65,7 +276,7 @@ class RAGProcessor:
 
         try:
             self.logger.info(f"'{name}' not in cache. Calling Gemini API...")
-            context = "\n".join([doc['content'] for doc in similar_docs]) or "No specific monograph information was found."
+            context = context or NO_CONTEXT_TEXT
             
             # --- IMPROVED AI PROMPT ---
             prompt = f"""
@@ -92,49 +303,133 @@ class RAGProcessor:
             """
             
             response = self.gemini_model.generate_content(prompt)
-            match = re.search(r"```json\s*(\{.*?\})\s*```", response.text, re.DOTALL)
+            match = _RE_JSON_FENCE.search(response.text)
             result = json.loads(match.group(1) if match else response.text)
-            
-            result['monograph_found'] = monograph_found
-            
-            self.cache[name] = result
-            self._save_cache()
-            return result
+            return self._store_classification(name, result, monograph_found, context_hash)
 
         except Exception as e:
             self.logger.error(f"Gemini classification failed for '{name}': {e}. Using fallback.")
             return self._fallback_classification(ingredient, monograph_found)
 
+    def _classify_with_gemini_batch(self, items: List[tuple]) -> List[Dict]:
+        """
+        Classifies several (ingredient, similar_docs, context, context_hash) items with one Gemini
+        call. Falls back to one call per item if the response is not an array of matching length.
+        """
+        if len(items) == 1 or not self.gemini_model:
+            return [self._classify_with_gemini(*item) for item in items]
+        try:
+            self.logger.info(f"{len(items)} ingredients not in cache. Calling Gemini API once for all of them...")
+            sections = []
+            for number, (ingredient, _, context, _) in enumerate(items, 1):
+                sections.append(f'Ingredient {number}: "{ingredient["name"]}"\nProvided Monograph Context:\n---\n{context or NO_CONTEXT_TEXT}\n---')
+            ingredient_sections = "\n\n".join(sections)
+            prompt = f"""
+            You are a strict regulatory analyst. Your task is to classify each medicinal ingredient below based ONLY on the monograph context provided for that ingredient.
+
+            {ingredient_sections}
+
+            Task, for each ingredient independently:
+            1. First, critically evaluate if its context is ACTUALLY about that ingredient.
+            2. If the context is irrelevant, state that clearly in your reasoning.
+            3. Provide a classification (Class 1, 2, or 3) and a confidence score (0.0-1.0).
+               - Class 1: Context fully supports the ingredient.
+               - Class 2: Context provides some support, but is not definitive.
+               - Class 3: Context is irrelevant, does not support the ingredient, or is insufficient.
+
+            Respond ONLY with a valid JSON array containing exactly {len(items)} objects, one per ingredient, in the same order as above.
+            Example element for irrelevant context:
+            {{"class": 3, "classification_text": "Class 3", "reasoning": "The provided context is for 'L-Carnitine', not 'Acerola'. Therefore, no valid classification can be made.", "confidence": 1.0}}
+            """
+
+            response = self.gemini_model.generate_content(prompt)
+            match = _RE_JSON_FENCE.search(response.text)
+            results = json.loads(match.group(1) if match else response.text)
+            if not isinstance(results, list) or len(results) != len(items) or not all(isinstance(result, dict) for result in results):
+                raise ValueError(f"expected a JSON array of {len(items)} objects")
+        except Exception as e:
+            self.logger.warning(f"Batch Gemini classification failed: {e}. Classifying one at a time.")
+            return [self._classify_with_gemini(*item) for item in items]
+        return [self._store_classification(ingredient['name'], result, bool(similar_docs), context_hash)
+                for (ingredient, similar_docs, _, context_hash), result in zip(items, results)]
+
     # ... The rest of the file (build_knowledge_base, helpers, etc.) is perfect ...
     def build_knowledge_base(self, source_directory: str):
         try:
-            self.chroma_client.delete_collection(name="nhp_monographs")
-            self.collection = self.chroma_client.create_collection(name="nhp_monographs")
-            all_chunks, all_metadatas = [], []
+            self.chroma_client.delete_collection(name=COLLECTION_NAME)
+            self.collection = self.chroma_client.create_collection(name=COLLECTION_NAME, metadata=COLLECTION_METADATA)
+            self._search_cache.clear()
             file_list = [f for f in os.listdir(source_directory) if f.endswith('.txt')]
-            for filename in file_list:
-                filepath = os.path.join(source_directory, filename)
-                with open(filepath, 'r', encoding='utf-8') as f: text_content = f.read()
-                chunks = self._split_document(text_content)
-                all_chunks.extend(chunks)
-                for i, chunk in enumerate(chunks): all_metadatas.append({'source': filename, 'chunk_id': i})
+            all_chunks, all_metadatas = self._read_and_chunk_all([os.path.join(source_directory, f) for f in file_list])
             if not all_chunks: return True
-            embeddings = self.embedding_model.encode(all_chunks).tolist()
+            embeddings = self._embed_chunks(all_chunks)
             ids = [f"{meta['source']}_{meta['chunk_id']}" for meta in all_metadatas]
             self.collection.add(embeddings=embeddings, documents=all_chunks, metadatas=all_metadatas, ids=ids)
             return True
         except Exception as e: return False
+    def add_documents(self, paths: List[str]) -> bool:
+        """Embeds only the given text files and adds them to the existing collection."""
+        try:
+            all_chunks, all_metadatas = self._read_and_chunk_all(paths)
+            # A re-uploaded monograph replaces its previous chunks
+            for filepath in paths: self.collection.delete(where={'source': os.path.basename(filepath)})
+            self._search_cache.clear()
+            if not all_chunks: return True
+            embeddings = self._embed_chunks(all_chunks)
+            ids = [f"{meta['source']}_{meta['chunk_id']}" for meta in all_metadatas]
+            self.collection.add(embeddings=embeddings, documents=all_chunks, metadatas=all_metadatas, ids=ids)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error adding documents to knowledge base: {str(e)}")
+            return False
+    def _embed_chunks(self, chunks: List[str]) -> List[List[float]]:
+        embeddings = self.embedding_model.encode(chunks, batch_size=EMBEDDING_BATCH_SIZE, convert_to_numpy=True, normalize_embeddings=True, show_progress_bar=False)
+        # Chroma takes plain lists; FP16 output from a GPU model is widened back to float32 first
+        return embeddings.astype(np.float32, copy=False).tolist()
+    def _read_and_chunk_all(self, paths: List[str]):
+        """Reads and chunks the files on a thread pool; chunks keep the order of paths."""
+        all_chunks, all_metadatas = [], []
+        if not paths: return all_chunks, all_metadatas
+        with ThreadPoolExecutor(max_workers=min(READ_MAX_WORKERS, len(paths))) as executor:
+            for chunks, metadatas in executor.map(self._read_and_chunk, paths):
+                all_chunks.extend(chunks)
+                all_metadatas.extend(metadatas)
+        return all_chunks, all_metadatas
+    def _read_and_chunk(self, filepath: str):
+        filename = os.path.basename(filepath)
+        with open(filepath, 'r', encoding='utf-8') as f: text_content = f.read()
+        chunks = self._split_document(text_content)
+        return chunks, [{'source': filename, 'chunk_id': i} for i in range(len(chunks))]
     def _split_document(self, text: str, chunk_size: int = 500, overlap: int = 50) -> List[str]:
-        words, chunks = text.split(), []
-        for i in range(0, len(words), chunk_size - overlap): chunks.append(' '.join(words[i:i + chunk_size]))
-        return chunks
+        words = text.split()
+        return list(map(' '.join, (words[i:i + chunk_size] for i in range(0, len(words), chunk_size - overlap))))
     def search_similar_documents(self, query: str, n_results: int = 3) -> List[Dict]:
+        return self.search_similar_documents_batch([query], n_results)[0]
+    def search_similar_documents_batch(self, queries: List[str], n_results: int = 3) -> List[List[Dict]]:
+        if not queries: return []
+        keys = [(self._cache_key(query), n_results) for query in queries]
         try:
-            results = self.collection.query(query_texts=[query], n_results=n_results)
-            if results.get('documents') and results['documents'][0]:
-                return [{'content': doc} for doc in results['documents'][0]]
-            return []
-        except Exception as e: return []
+            count = self.collection.count()
+            with self._cache_lock:
+                if count != self._search_cache_count:
+                    self._search_cache.clear()
+                    self._search_cache_count = count
+                hits = {key: self._search_cache[key] for key in keys if key in self._search_cache}
+            pending = [key for key in dict.fromkeys(keys) if key not in hits]
+            if pending:
+                embeddings = self._embed_names([key[0] for key in pending])
+                results = self.collection.query(query_embeddings=embeddings.tolist(), n_results=n_results)
+                documents = results.get('documents') or []
+                for i, key in enumerate(pending):
+                    hits[key] = [{'content': doc} for doc in (documents[i] if i < len(documents) and documents[i] else [])]
+            with self._cache_lock:
+                for key in keys:
+                    self._search_cache[key] = hits[key]
+                    self._search_cache.move_to_end(key)
+                while len(self._search_cache) > SEARCH_CACHE_SIZE: self._search_cache.popitem(last=False)
+            return [hits[key] for key in keys]
+        except Exception as e:
+            with self._cache_lock: return [self._search_cache.get(key, []) for key in keys]
     def _fallback_classification(self, ingredient: Dict, monograph_found: bool) -> Dict:
         reasoning = f"Gemini AI analysis failed. Defaulting to Class 3 for manual review of '{ingredient['name']}'."
         return {"class": 3, "classification_text": "Class 3 (Fallback)", "reasoning": reasoning, "confidence": 0.1, "monograph_found": monograph_found}
@@ -146,10 +441,14 @@ class RAGProcessor:
         except: return 0
     def reset_knowledge_base(self):
         try:
-            self.chroma_client.delete_collection(name="nhp_monographs")
-            self.collection = self.chroma_client.create_collection(name="nhp_monographs")
-            self.cache = {}
-            self._save_cache()
+            self.chroma_client.delete_collection(name=COLLECTION_NAME)
+            self.collection = self.chroma_client.create_collection(name=COLLECTION_NAME, metadata=COLLECTION_METADATA)
+            self._search_cache.clear()
+            with self._cache_lock:
+                self.cache = {}
+                self._dirty = True
+            self.flush_cache()
+            self._semantic_keys, self._semantic_matrix = None, None
         except Exception as e:
             self.logger.error(f"Error resetting knowledge base: {str(e)}")
             raise
\ No newline at end of file
@@ -0,0 +1,91 @@
+import os
+import logging
+import tempfile
+
+from rq import get_current_job
+
+from rag_processor import RAGProcessor
+from pdf_processor import PDFProcessor
+
+# Instantiated once per process: an RQ worker loads the OCR/embedding stack a
+# single time and reuses it for every job it picks up.
+pdf_processor = PDFProcessor()
+rag_processor = RAGProcessor()
+
+logger = logging.getLogger(__name__)
+
+# Bumped in Redis whenever the knowledge base changes, so the web processes know to
+# re-fetch their collection handle and drop cached searches (see app.sync_knowledge_base)
+KB_GENERATION_KEY = 'nhp:kb_generation'
+
+os.makedirs('data/monographs', exist_ok=True)
+os.makedirs('data/processed', exist_ok=True)
+
+def process_uploaded_monographs(uploads):
+    """
+    RQ entry point. The worker runs as its own service without access to the web service's disk,
+    so the uploaded PDFs travel in the job as (filename, bytes) pairs and are written locally first.
+    """
+    # A reset from the web service recreates the collection, leaving this worker's handle stale
+    rag_processor.refresh_collection()
+    files_to_process = []
+    try:
+        for filename, data in uploads:
+            # Unique path per part, as on the web side: a job can carry two uploads with the same name
+            fd, filepath = tempfile.mkstemp(dir='data/monographs', prefix=filename.rsplit('.', 1)[0] + '-', suffix='.pdf')
+            files_to_process.append((filename, filepath))
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+        return process_monographs_background(files_to_process)
+    except Exception:
+        # The job will be retried with the same uploads; don't leave this attempt's copies behind
+        for _, filepath in files_to_process:
+            if os.path.exists(filepath): os.remove(filepath)
+        raise
+
+def process_monographs_background(files_to_process):
+    """
+    Extracts, stores and indexes the given (filename, filepath) PDFs. Raises when no file could be
+    processed or the knowledge base update fails, so RQ marks the job failed and retries it;
+    otherwise returns the processed and failed filenames.
+    """
+    logger.info(f"Starting background processing for {len(files_to_process)} files.")
+    processed_paths, processed, failed = [], [], []
+    for filename, filepath in files_to_process:
+        try:
+            # Monographs are only chunked into words for embedding, so table layout is not needed
+            text_content = pdf_processor.extract_text_from_pdf(filepath, preserve_layout=False)
+
+            if text_content:
+                text_filename = filename.rsplit('.', 1)[0] + '.txt'
+                text_filepath = os.path.join('data/processed', text_filename)
+                with open(text_filepath, 'w', encoding='utf-8') as f:
+                    f.write(text_content)
+                processed_paths.append(text_filepath)
+                processed.append(filename)
+                logger.info(f"Successfully processed {filename} in background.")
+            else:
+                logger.warning(f"Failed to extract text from {filename} in background.")
+                failed.append(filename)
+        except Exception as e:
+            logger.error(f"Error processing {filename} in background: {e}", exc_info=True)
+            failed.append(filename)
+
+    if not processed_paths:
+        raise RuntimeError(f"No text could be extracted from any of {len(files_to_process)} files: {failed}")
+    # Always added to, never rebuilt: deleting and recreating the collection here would leave
+    # the web processes holding a handle to a dropped collection.
+    logger.info(f"Background processing complete. Adding {len(processed_paths)} documents to the knowledge base...")
+    if not rag_processor.add_documents(processed_paths):
+        raise RuntimeError(f"Failed to add {len(processed_paths)} documents to the knowledge base.")
+    announce_knowledge_base_change()
+    logger.info("Knowledge base update complete.")
+    return {'processed': processed, 'failed': failed}
+
+def announce_knowledge_base_change(redis_conn=None):
+    """Bumps the knowledge base generation; a no-op outside an RQ job unless a connection is given."""
+    if redis_conn is None:
+        job = get_current_job()
+        if job is None: return  # in-process fallback: this process's own caches are already current
+        redis_conn = job.connection
+    redis_conn.incr(KB_GENERATION_KEY)
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""
+RQ worker for background monograph processing
+Run with: python worker.py  (requires REDIS_URL)
+"""
+
+import os
+from redis import Redis
+from rq import Queue
+from rq.worker import SimpleWorker
+
+if __name__ == "__main__":
+    # Importing tasks loads PDFProcessor/RAGProcessor once for the lifetime of the worker.
+    # It stays under the guard: the OCR pool's forkserver/spawn children re-import this module
+    # as __mp_main__ and must not load the models again.
+    import tasks
+
+    redis_conn = Redis.from_url(os.environ['REDIS_URL'])
+    # SimpleWorker runs jobs in this process instead of forking a work horse per job,
+    # so the embedding model and Chroma client stay loaded between jobs.
+    worker = SimpleWorker([Queue('monographs', connection=redis_conn)], connection=redis_conn)
+    worker.work()